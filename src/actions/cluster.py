@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import ipaddress
 import os
 import sys
 
@@ -32,9 +33,9 @@ import charms_openstack.charm
 import charms.reactive as reactive
 import charmhelpers.core as ch_core
 import charmhelpers.contrib.network.ovs.ovn as ch_ovn
-import charmhelpers.contrib.network.ip as ch_ip
 
-charms_openstack.bus.discover()
+# Prefer libyaml bindings for emitting action output when available.
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
 
 class StatusParsingException(Exception):
@@ -46,24 +47,21 @@ def _url_to_ip(cluster_url):
 
     OVN cluster uses urls like "ssl:10.0.0.1:6644". This function parses the
     IP portion out of the url. This function works with IPv4 and IPv6
-    addresses.
+    addresses. IPv6 addresses may optionally be enclosed in brackets.
 
     :raises StatusParsingException: If cluster_url does not contain valid IP
         address.
-    :param cluster_url: OVN server url. Like "ssl:10.0.0.1".
+    :param cluster_url: OVN server url. Like "ssl:10.0.0.1:6644".
     :type cluster_url: str
     :return: Parsed out IP address
     :rtype: str
     """
-    ip_portion = cluster_url.split(":")[1:-1]
-    if len(ip_portion) > 1:
-        # Possible IPv6 address
-        ip_str = ":".join(ip_portion)
-    else:
-        # Likely a IPv4 address
-        ip_str = "".join(ip_portion)
-
-    if not ch_ip.is_ip(ip_str):
+    try:
+        # Strip the protocol prefix and port suffix, whatever remains in
+        # between is the address.
+        ip_str = cluster_url.rsplit(":", 1)[0].split(":", 1)[1].strip("[]")
+        ipaddress.ip_address(ip_str)
+    except (IndexError, ValueError):
         raise StatusParsingException(
             "Failed to parse OVN cluster status. Cluster member address "
             "has unexpected format: {}".format(cluster_url)
@@ -96,16 +94,15 @@ def _format_cluster_status(raw_cluster_status, cluster_ip_map):
     """
     mapped_servers = {}
     unknown_servers = []
+    ip_to_unit = {ip: unit for unit, ip in cluster_ip_map.items()}
 
     #  Map unit name to each server in the Servers field.
     for server_id, server_url in raw_cluster_status.servers:
-        member_address = _url_to_ip(server_url)
-        for unit, ip in cluster_ip_map.items():
-            if member_address == ip:
-                mapped_servers[unit] = server_id
-                break
-        else:
+        unit = ip_to_unit.get(_url_to_ip(server_url))
+        if unit is None:
             unknown_servers.append(server_id)
+        else:
+            mapped_servers[unit] = server_id
 
     cluster = raw_cluster_status.to_yaml()
 
@@ -166,6 +163,9 @@ def _kick_server(cluster, server_id):
 
 def cluster_status():
     """Implementation of a "cluster-status" action."""
+    # Charm class discovery is only needed to get hold of a charm instance,
+    # so it is deferred to here to keep the other actions cheap.
+    charms_openstack.bus.discover()
     with charms_openstack.charm.provide_charm_instance() as charm_instance:
         sb_status = charm_instance.cluster_status("ovnsb_db")
         nb_status = charm_instance.cluster_status("ovnnb_db")
@@ -178,12 +178,10 @@ def cluster_status():
         ch_core.hookenv.action_fail(str(exc))
         return
 
-    ch_core.hookenv.action_set(
-        {"ovnsb": yaml.safe_dump(sb_cluster, sort_keys=False)}
-    )
-    ch_core.hookenv.action_set(
-        {"ovnnb": yaml.safe_dump(nb_cluster, sort_keys=False)}
-    )
+    ch_core.hookenv.action_set({
+        "ovnsb": yaml.dump(sb_cluster, Dumper=YAML_DUMPER, sort_keys=False),
+        "ovnnb": yaml.dump(nb_cluster, Dumper=YAML_DUMPER, sort_keys=False),
+    })
 
 
 def cluster_kick():
@@ -26,7 +26,7 @@ if __name__ == "__main__":
     if os.path.exists(output_path):
         with open(output_path) as fd:
             try:
-                status = json.loads(fd.read())
+                status = json.load(fd)
                 ts = datetime.strptime(status['last_updated'],
                                        "%Y-%m-%d %H:%M:%S")
                 if datetime.now() - ts > timedelta(days=1):
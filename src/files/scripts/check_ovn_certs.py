@@ -15,7 +15,9 @@
 
 import os
 import json
-from datetime import datetime
+import tempfile
+from datetime import datetime, timezone
+from functools import cached_property
 
 from cryptography.hazmat.backends import default_backend
 from cryptography import x509
@@ -34,19 +36,27 @@ class SSLCertificate(object):
     def __init__(self, path):
         self.path = path
 
-    @property
+    @cached_property
     def cert(self):
         with open(self.path, "rb") as fd:
             return fd.read()
 
+    @cached_property
+    def x509_cert(self):
+        return x509.load_pem_x509_certificate(self.cert, default_backend())
+
     @property
     def expiry_date(self):
-        cert = x509.load_pem_x509_certificate(self.cert, default_backend())
-        return cert.not_valid_after
+        try:
+            return self.x509_cert.not_valid_after_utc
+        except AttributeError:
+            # cryptography < 42 only provides a naive datetime in UTC.
+            return self.x509_cert.not_valid_after.replace(
+                tzinfo=timezone.utc)
 
     @property
     def days_remaining(self):
-        return int((self.expiry_date - datetime.now()).days)
+        return int((self.expiry_date - datetime.now(timezone.utc)).days)
 
 
 def check_ovn_certs():
@@ -92,17 +102,27 @@ def check_ovn_certs():
         message = "all certs healthy"
         exit_code = SUCCESS
 
-    ts = datetime.now()
-    with open(output_path, 'w') as fd:
-        fd.write(json.dumps({'message': message,
-                             'exit_code': exit_code,
-                             'last_updated':
-                             "{}-{}-{} {}:{}:{}".format(ts.year, ts.month,
-                                                        ts.day, ts.hour,
-                                                        ts.minute,
-                                                        ts.second)}))
-
-    os.chmod(output_path, 644)
+    ts = datetime.now().isoformat(sep=' ', timespec='seconds')
+    # Write to a temporary file and move it into place so the NRPE check
+    # never reads a partially written status file.
+    with tempfile.NamedTemporaryFile(mode='w', dir=NAGIOS_PLUGIN_DATA,
+                                     prefix='ovn_cert_status.',
+                                     delete=False) as fd:
+        tmp_output_path = fd.name
+        try:
+            fd.write(json.dumps({'message': message,
+                                 'exit_code': exit_code,
+                                 'last_updated': ts}))
+            fd.flush()
+            # Temporary files are created 0600, make it readable by the
+            # nagios user before it is moved into place.
+            os.fchmod(fd.fileno(), 0o644)
+            os.fsync(fd.fileno())
+        except Exception:
+            os.unlink(tmp_output_path)
+            raise
+
+    os.replace(tmp_output_path, output_path)
 
 
 if __name__ == "__main__":
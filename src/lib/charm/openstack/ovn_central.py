@@ -13,6 +13,8 @@
 # limitations under the License.
 
 import collections
+import functools
+import itertools
 import operator
 import os
 import subprocess
@@ -51,6 +53,25 @@ CRONJOB_CMD = "{schedule} root {command} 2>&1 | logger -p local0.notice\n"
 PEER_RELATION = 'ovsdb-peer'
 CERT_RELATION = 'certificates'
 
+# Networking services whose restarts are deferred in addition to the ones
+# managed by the charm.
+EXTRA_DEFERABLE_SERVICES = frozenset((
+    'ovn-ovsdb-server-nb',
+    'ovn-ovsdb-server-sb',
+    'ovn-northd',
+    'ovn-central',
+))
+
+
+@functools.lru_cache(maxsize=1)
+def _lsb_release():
+    """Return release information of the host, read once per hook.
+
+    :returns: Parsed contents of /etc/lsb-release
+    :rtype: Dict[str,str]
+    """
+    return ch_core.host.lsb_release()
+
 
 # NOTE(fnordahl): We should split the ``OVNConfigurationAdapter`` in
 # ``layer-ovn`` into common and chassis specific parts so we can re-use the
@@ -59,15 +80,15 @@ class OVNCentralConfigurationAdapter(
         charms_openstack.adapters.ConfigurationAdapter):
     """Provide a configuration adapter for OVN Central."""
 
-    @property
+    @functools.cached_property
     def ovn_key(self):
         return os.path.join(self.charm_instance.ovn_sysconfdir(), 'key_host')
 
-    @property
+    @functools.cached_property
     def ovn_cert(self):
         return os.path.join(self.charm_instance.ovn_sysconfdir(), 'cert_host')
 
-    @property
+    @functools.cached_property
     def ovn_ca_cert(self):
         return os.path.join(self.charm_instance.ovn_sysconfdir(),
                             '{}.crt'.format(self.charm_instance.name))
@@ -80,7 +101,7 @@ class OVNCentralConfigurationAdapter(
     def _ovn_source(self):
         if (not self.ovn_source
                 and reactive.is_flag_set('leadership.set.install_stamp')
-                and ch_core.host.lsb_release()['DISTRIB_CODENAME'] == 'focal'):
+                and _lsb_release()['DISTRIB_CODENAME'] == 'focal'):
             return 'cloud:focal-ovn-22.03'
         return self.ovn_source
 
@@ -127,6 +148,8 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
     min_election_timer = 1
     max_election_timer = 60
     exporter_service = 'snap.prometheus-ovn-exporter.ovn-exporter'
+    # Number of seconds a retrieved cluster status is considered current
+    cluster_status_ttl = 2
 
     def __init__(self, **kwargs):
         """Override class init to populate restart map with instance method."""
@@ -135,6 +158,8 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
             os.path.join(self.ovn_sysconfdir(),
                          'ovn-northd-db-params.conf'): ['ovn-northd'],
         }
+        self._cluster_status_cache = {}
+        self._sources_configured = False
         super().__init__(**kwargs)
 
     def restart_on_change(self):
@@ -169,10 +194,7 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
         NOTE: It does not matter if one of the services in the list is not
         installed on the system.
         """
-        svcs = self.services[:]
-        svcs.extend(['ovn-ovsdb-server-nb', 'ovn-ovsdb-server-nb',
-                     'ovn-northd', 'ovn-central'])
-        return list(set(svcs))
+        return list(EXTRA_DEFERABLE_SERVICES.union(self.services))
 
     def configure_ovn_source(self):
         """Configure the OVN overlay archive."""
@@ -211,10 +233,16 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
         separate files depending on the value of the options.
 
         Ref: https://github.com/juju/charm-helpers/commit/982319b136b
+
+        Sources are configured, and the apt cache updated, at most once for
+        the lifetime of the charm instance, i.e. once per hook.
         """
+        if self._sources_configured:
+            return
         self.configure_ovn_source()
         if self.source_config_key:
             self.configure_source()
+        self._sources_configured = True
 
     def install(self, service_masks=None):
         """Extend the default install method.
@@ -279,8 +307,23 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
             self.do_openstack_pkg_upgrade(upgrade_openstack=False)
             self.render_with_interfaces(interfaces_list)
 
+    def render_with_interfaces(self, interfaces, configs=None):
+        """Render configs and discard any cached cluster status.
+
+        Rendering may restart the ovsdb-server services through
+        restart_on_change, after which cluster status retrieved earlier in
+        the hook can no longer be relied upon.
+
+        :param interfaces: List of instances of interface classes
+        :type interfaces: List
+        :param configs: List of config files to render, all if None
+        :type configs: Optional[List[str]]
+        """
+        super().render_with_interfaces(interfaces, configs=configs)
+        self.invalidate_cluster_status()
+
     def configure_deferred_restarts(self):
-        if 'enable-auto-restarts' in ch_core.hookenv.config().keys():
+        if 'enable-auto-restarts' in ch_core.hookenv.config():
             deferred_events.configure_deferred_restarts(
                 self.deferable_services)
             # Reactive charms execute perm missing.
@@ -346,6 +389,10 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
     def ovn_rundir():
         return '/var/run/ovn'
 
+    @staticmethod
+    def ovn_dbdir():
+        return '/var/lib/ovn'
+
     def _default_port_list(self, *_):
         """Return list of ports the payload listens to.
 
@@ -397,11 +444,10 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
         _services, _ports = ch_cluster.get_managed_services_and_ports(
             self.services,
             self.ports_to_check(self.active_api_ports))
-        ssl_info = SSLPortCheckInfo(os.path.join(self.ovn_sysconfdir(),
-                                                 'key_host'),
-                                    os.path.join(self.ovn_sysconfdir(),
-                                                 'cert_host'),
-                                    os.path.join(self.ovn_sysconfdir(),
+        sysconfdir = self.ovn_sysconfdir()
+        ssl_info = SSLPortCheckInfo(os.path.join(sysconfdir, 'key_host'),
+                                    os.path.join(sysconfdir, 'cert_host'),
+                                    os.path.join(sysconfdir,
                                                  'ovn-central.crt'))
         try:
             return os_utils.ows_check_services_running(services=_services,
@@ -438,28 +484,51 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
             return False
         for service in self.services:
             ch_core.host.service_resume(service)
+        self.invalidate_cluster_status()
         return True
 
     def cluster_status(self, db):
         """OVN version agnostic cluster_status helper.
 
+        The status is retrieved from ovsdb-server at most once per
+        ``cluster_status_ttl`` seconds, as it is consulted several times
+        during a single hook execution.
+
         :param db: Database to operate on
         :type db: str
         :returns: Object describing the cluster status or None
         :rtype: Optional[ch_ovn.OVNClusterStatus]
         """
+        now = time.monotonic()
+        cached = self._cluster_status_cache.get(db)
+        if cached and now - cached[0] < self.cluster_status_ttl:
+            return cached[1]
         try:
             # The charm will attempt to retrieve cluster status before OVN
             # is clustered and while units are paused, so we need to handle
             # errors from this call gracefully.
-            return ch_ovn.cluster_status(db, rundir=self.ovn_rundir(),
-                                         use_ovs_appctl=(
-                                             self.release == 'train'))
+            status = ch_ovn.cluster_status(db, rundir=self.ovn_rundir(),
+                                           use_ovs_appctl=(
+                                               self.release == 'train'))
         except (ValueError, subprocess.CalledProcessError) as e:
             ch_core.hookenv.log('Unable to get cluster status, ovsdb-server '
                                 'not ready yet?: {}'.format(e),
                                 level=ch_core.hookenv.DEBUG)
+            self._cluster_status_cache.pop(db, None)
             return
+        self._cluster_status_cache[db] = (now, status)
+        return status
+
+    def invalidate_cluster_status(self, db=None):
+        """Discard cached cluster status.
+
+        :param db: Database to discard status for, all if None
+        :type db: Optional[str]
+        """
+        if db is None:
+            self._cluster_status_cache.clear()
+        else:
+            self._cluster_status_cache.pop(db, None)
 
     def cluster_status_message(self):
         """Get cluster status message suitable for use as workload message.
@@ -530,18 +599,15 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
         :type remote_conn: Union[str, ...]
         :raises: subprocess.CalledProcessError
         """
-        if self.release == 'train':
-            absolute_path = os.path.join('/var/lib/openvswitch', db_file)
-        else:
-            absolute_path = os.path.join('/var/lib/ovn', db_file)
+        absolute_path = os.path.join(self.ovn_dbdir(), db_file)
         if os.path.exists(absolute_path):
             ch_core.hookenv.log('OVN database "{}" exists on disk, not '
                                 'creating a new one joining cluster',
                                 level=ch_core.hookenv.DEBUG)
             return
         cmd = ['ovsdb-tool', 'join-cluster', absolute_path, schema_name]
-        cmd.extend(list(local_conn))
-        cmd.extend(list(remote_conn))
+        cmd.extend(local_conn)
+        cmd.extend(remote_conn)
         ch_core.hookenv.log(cmd, level=ch_core.hookenv.INFO)
         self.run(*cmd)
 
@@ -556,13 +622,13 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
             certificates_interface=certificates_interface)
 
         for tls_object in tls_objects:
-            with open(
-                    self.options.ovn_ca_cert, 'w') as crt:
-                chain = tls_object.get('chain')
-                if chain:
-                    crt.write(tls_object['ca'] + os.linesep + chain)
-                else:
-                    crt.write(tls_object['ca'])
+            ca_cert = tls_object['ca']
+            chain = tls_object.get('chain')
+            if chain:
+                ca_cert += os.linesep + chain
+            # write_file() leaves the file alone when content is unchanged
+            write_file(self.options.ovn_ca_cert, ca_cert.encode('UTF-8'),
+                       perms=0o644)
 
             self.configure_cert(self.ovn_sysconfdir(),
                                 tls_object['cert'],
@@ -593,13 +659,30 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
                                 level=ch_core.hookenv.DEBUG)
             connections = ch_ovsdb.SimpleOVSDB(
                 'ovn-{}ctl'.format(db)).connection
+            existing = {
+                connection['target']: connection
+                for connection in connections
+            }
+            # Collect all changes and apply them in a single transaction
+            cmd = []
             for port, settings in port_map.items():
                 ch_core.hookenv.log('port {} {}'.format(port, settings),
                                     level=ch_core.hookenv.DEBUG)
-                # discover and create any non-existing listeners first
-                for connection in connections.find(
-                        'target="pssl:{}"'.format(port)):
-                    break
+                connection = existing.get('pssl:{}'.format(port))
+                if connection:
+                    # update settings of existing listener
+                    changed = [
+                        '{}={}'.format(k, v)
+                        for k, v in settings.items()
+                        if str(connection.get(k)) != str(v)
+                    ]
+                    if changed:
+                        ch_core.hookenv.log(
+                            'set {} {}'
+                            .format(str(connection['_uuid']), changed),
+                            level=ch_core.hookenv.DEBUG)
+                        cmd.extend(['--', 'set', 'connection',
+                                    str(connection['_uuid'])] + changed)
                 else:
                     ch_core.hookenv.log('create port {}'.format(port),
                                         level=ch_core.hookenv.DEBUG)
@@ -608,23 +691,17 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
                     # specific space/address here.  We might consider not
                     # using listener configuration from DB, but that is
                     # currently not supported by ``ovn-ctl`` script.
-                    self.run('ovn-{}ctl'.format(db),
-                             '--',
-                             '--id=@connection',
-                             'create', 'connection',
-                             'target="pssl:{}"'.format(port),
-                             '--',
-                             'add', '{}_Global'.format(db.upper()),
-                             '.', 'connections', '@connection')
-                # set/update connection settings
-                for connection in connections.find(
-                        'target="pssl:{}"'.format(port)):
-                    for k, v in settings.items():
-                        ch_core.hookenv.log(
-                            'set {} {} {}'
-                            .format(str(connection['_uuid']), k, v),
-                            level=ch_core.hookenv.DEBUG)
-                        connections.set(str(connection['_uuid']), k, v)
+                    conn_id = '@connection{}'.format(port)
+                    cmd.extend(['--', '--id={}'.format(conn_id),
+                                'create', 'connection',
+                                'target="pssl:{}"'.format(port)])
+                    cmd.extend('{}={}'.format(k, v)
+                               for k, v in settings.items())
+                    cmd.extend(['--',
+                                'add', '{}_Global'.format(db.upper()),
+                                '.', 'connections', conn_id])
+            if cmd:
+                self.run('ovn-{}ctl'.format(db), *cmd)
 
     def configure_ovsdb_election_timer(self, db, tgt_timer):
         """Set the OVSDB cluster Raft election timer.
@@ -709,6 +786,7 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
                 # again
                 time.sleep((cur_timer + change_timer) / 1000)
                 cur_timer = change_timer
+                self.invalidate_cluster_status(ovn_db)
                 status = self.cluster_status(ovn_db)
 
     def configure_ovn(self, nb_port, sb_port, sb_admin_port):
@@ -721,6 +799,10 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
         :param sb_admin_port: Port for cluster private Southbound DB listener
         :type sb_admin_port: int
         """
+        # Listener and election timer changes are only made on the leader,
+        # make sure leadership is not judged from status retrieved before
+        # a service restart.
+        self.invalidate_cluster_status()
         inactivity_probe = int(
             self.config['ovsdb-server-inactivity-probe']) * 1000
 
@@ -736,9 +818,6 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
                     'role': 'ovn-controller',
                     'inactivity_probe': inactivity_probe,
                 },
-            })
-        self.configure_ovn_listener(
-            'sb', {
                 sb_admin_port: {
                     'inactivity_probe': inactivity_probe,
                 },
@@ -773,31 +852,43 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
         """
         ufw_comment = 'charm-' + self.name
 
+        # store List copy of addrs to iterate over them multiple times
+        port_addrs = [(ports, list(addrs or []))
+                      for ports, addrs in port_addr_map.items()]
+        allowed_addrs = set()
+        for _, addrs in port_addrs:
+            allowed_addrs.update(addrs)
+
+        # find existing rules managed by us, and delete the ones that do not
+        # match provided addresses. This is done before adding any rules as
+        # that would change the rule numbers.
+        existing_rules = set()
+        delete_rules = []
+        for num, rule in ch_ufw.status():
+            if (rule.get('comment') != ufw_comment or
+                    rule['action'] != 'allow in'):
+                continue
+            if rule['from'] in allowed_addrs:
+                existing_rules.add((rule['from'], rule['to']))
+            else:
+                delete_rules.append(num)
+        for rule in sorted(delete_rules, reverse=True):
+            ch_ufw.modify_access(None, dst=None, action='delete', index=rule)
+
         # reject connection to protected ports
-        for port in set().union(*port_addr_map.keys()):
+        for port in set(itertools.chain.from_iterable(port_addr_map)):
             ch_ufw.modify_access(src=None, dst='any', port=port,
                                  proto='tcp', action='reject',
                                  comment=ufw_comment)
-        # allow connections from provided addresses
-        allowed_addrs = {}
-        for ports, addrs in port_addr_map.items():
-            # store List copy of addrs to iterate over it multiple times
-            _addrs = list(addrs or [])
+        # allow connections from provided addresses, unless already allowed
+        for ports, addrs in port_addrs:
             for port in ports:
-                for addr in _addrs:
+                for addr in addrs:
+                    if (addr, '{}/tcp'.format(port)) in existing_rules:
+                        continue
                     ch_ufw.modify_access(addr, port=port, proto='tcp',
                                          action='allow', prepend=True,
                                          comment=ufw_comment)
-                    allowed_addrs[addr] = 1
-        # delete any rules managed by us that do not match provided addresses
-        delete_rules = []
-        for num, rule in ch_ufw.status():
-            if 'comment' in rule and rule['comment'] == ufw_comment:
-                if (rule['action'] == 'allow in' and
-                        rule['from'] not in allowed_addrs):
-                    delete_rules.append(num)
-        for rule in sorted(delete_rules, reverse=True):
-            ch_ufw.modify_access(None, dst=None, action='delete', index=rule)
 
     def render_nrpe(self):
         """Configure Nagios NRPE checks."""
@@ -810,8 +901,9 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
         charm_nrpe.write()
 
     def add_nrpe_certs_check(self, charm_nrpe):
+        charm_dir = os.getenv('CHARM_DIR')
         script = 'nrpe_check_ovn_certs.py'
-        src = os.path.join(os.getenv('CHARM_DIR'), 'files', 'nagios', script)
+        src = os.path.join(charm_dir, 'files', 'nagios', script)
         dst = os.path.join(NAGIOS_PLUGINS, script)
         rsync(src, dst)
         charm_nrpe.add_check(
@@ -821,9 +913,12 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
         )
         # Need to install this as a system package since it is needed by the
         # cron script that runs outside of the charm.
-        ch_fetch.apt_install(['python3-cryptography'])
+        missing_pkgs = ch_fetch.filter_installed_packages(
+            ['python3-cryptography'])
+        if missing_pkgs:
+            ch_fetch.apt_install(missing_pkgs)
         script = 'check_ovn_certs.py'
-        src = os.path.join(os.getenv('CHARM_DIR'), 'files', 'scripts', script)
+        src = os.path.join(charm_dir, 'files', 'scripts', script)
         dst = os.path.join(SCRIPTS_DIR, script)
         rsync(src, dst)
         cronjob = CRONJOB_CMD.format(
@@ -884,11 +979,11 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
             ch_core.host.service_restart(self.exporter_service)
             reactive.set_flag('prometheus-ovn-exporter.initialized')
 
-    @staticmethod
-    def leave_cluster():
+    def leave_cluster(self):
         """Run commands to remove servers running on this unit from cluster.
 
-        In case the commands fail, an ERROR message will be logged.
+        In case the commands fail, an ERROR message will be logged. Any cached
+        cluster status is discarded afterwards.
         :return: None
         :rtype: None
         """
@@ -920,6 +1015,8 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
                 ch_core.hookenv.ERROR
             )
 
+        self.invalidate_cluster_status()
+
     @staticmethod
     def is_server_in_cluster(server_ip, cluster_status):
         """Parse cluster status and find if server with given IP is part of it.
@@ -933,8 +1030,8 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
         """
         remote_unit_url = "ssl:{}:".format(server_ip)
         return any(
-            list(server)[1].startswith(remote_unit_url)
-            for server in cluster_status.servers
+            address.startswith(remote_unit_url)
+            for _, address in cluster_status.servers
         )
 
     def wait_for_server_leave(self, server_ip, timeout=30):
@@ -944,12 +1041,14 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
             the clusters.
         :type server_ip: str
         :param timeout: How many seconds should this function wait for the
-            servers to leave. The timeout should be an increment of 5.
+            servers to leave. The cluster status is polled with a delay that
+            starts at 0.25 seconds and doubles up to 5 seconds.
         :return: True if servers from selected unit departed within the
             timeout window. Otherwise, it returns False.
         :rtype: bool
         """
-        tick = 5
+        tick = 0.25
+        max_tick = 5
         timer = 0
         unit_in_sb_cluster = unit_in_nb_cluster = True
         servers_left = False
@@ -960,6 +1059,7 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
             server_ip
         )
         while timer < timeout:
+            self.invalidate_cluster_status()
             if unit_in_sb_cluster:
                 ch_core.hookenv.log(wait_sb_msg, ch_core.hookenv.INFO)
                 unit_in_sb_cluster = self.is_server_in_cluster(
@@ -982,6 +1082,7 @@ class BaseOVNCentralCharm(charms_openstack.charm.OpenStackCharm):
                 break
             time.sleep(tick)
             timer += tick
+            tick = min(tick * 2, max_tick)
 
         return servers_left
 
@@ -1050,6 +1151,10 @@ class TrainOVNCentralCharm(BaseOVNCentralCharm):
     def ovn_rundir():
         return '/var/run/openvswitch'
 
+    @staticmethod
+    def ovn_dbdir():
+        return '/var/lib/openvswitch'
+
 
 class UssuriOVNCentralCharm(BaseOVNCentralCharm):
     # OpenvSwitch and OVN is distributed as part of the Ubuntu Cloud Archive
@@ -165,16 +165,20 @@ def enable_default_certificates():
 def configure_firewall():
     ovsdb_peer = reactive.endpoint_from_flag('ovsdb-peer.available')
     ovsdb_cms = reactive.endpoint_from_flag('ovsdb-cms.connected')
+    nb_port = ovsdb_peer.db_nb_port
+    sb_admin_port = ovsdb_peer.db_sb_admin_port
+    sb_cluster_port = ovsdb_peer.db_sb_cluster_port
+    nb_cluster_port = ovsdb_peer.db_nb_cluster_port
     with charm.provide_charm_instance() as ovn_charm:
         ovn_charm.configure_firewall({
-            (ovsdb_peer.db_nb_port,
-                ovsdb_peer.db_sb_admin_port,
-                ovsdb_peer.db_sb_cluster_port,
-                ovsdb_peer.db_nb_cluster_port,):
+            (nb_port,
+                sb_admin_port,
+                sb_cluster_port,
+                nb_cluster_port,):
             ovsdb_peer.cluster_remote_addrs,
             # NOTE(fnordahl): Tactical workaround for LP: #1864640
-            (ovsdb_peer.db_nb_port,
-                ovsdb_peer.db_sb_admin_port,):
+            (nb_port,
+                sb_admin_port,):
             ovsdb_cms.client_remote_addrs if ovsdb_cms else None,
         })
         ovn_charm.assess_status()
@@ -188,11 +192,12 @@ def configure_firewall():
                'certificates.available')
 def publish_addr_to_clients():
     ovsdb_peer = reactive.endpoint_from_flag('ovsdb-peer.available')
-    for ep in [reactive.endpoint_from_flag('ovsdb.connected'),
-               reactive.endpoint_from_flag('ovsdb-cms.connected')]:
+    cluster_local_addr = ovsdb_peer.cluster_local_addr
+    for flag in ('ovsdb.connected', 'ovsdb-cms.connected'):
+        ep = reactive.endpoint_from_flag(flag)
         if not ep:
             continue
-        ep.publish_cluster_local_addr(ovsdb_peer.cluster_local_addr)
+        ep.publish_cluster_local_addr(cluster_local_addr)
 
 
 @reactive.when_none('is-update-status-hook')
@@ -248,20 +253,22 @@ def render():
         #
         # Replace this with functionality in ``ovn-ctl`` when support has been
         # added upstream.
+        local_addrs = (ovsdb_peer.cluster_local_addr,)
+        # The remote addresses are gathered from relation data, retrieve them
+        # once for use with both databases.
+        remote_addrs = tuple(ovsdb_peer.cluster_remote_addrs)
+        nb_cluster_port = ovsdb_peer.db_nb_cluster_port
+        sb_cluster_port = ovsdb_peer.db_sb_cluster_port
         ovn_charm.join_cluster('ovnnb_db.db', 'OVN_Northbound',
                                ovsdb_peer.db_connection_strs(
-                                   (ovsdb_peer.cluster_local_addr,),
-                                   ovsdb_peer.db_nb_cluster_port),
+                                   local_addrs, nb_cluster_port),
                                ovsdb_peer.db_connection_strs(
-                                   ovsdb_peer.cluster_remote_addrs,
-                                   ovsdb_peer.db_nb_cluster_port))
+                                   remote_addrs, nb_cluster_port))
         ovn_charm.join_cluster('ovnsb_db.db', 'OVN_Southbound',
                                ovsdb_peer.db_connection_strs(
-                                   (ovsdb_peer.cluster_local_addr,),
-                                   ovsdb_peer.db_sb_cluster_port),
+                                   local_addrs, sb_cluster_port),
                                ovsdb_peer.db_connection_strs(
-                                   ovsdb_peer.cluster_remote_addrs,
-                                   ovsdb_peer.db_sb_cluster_port))
+                                   remote_addrs, sb_cluster_port))
         if ovn_charm.enable_services():
             # Handle any post deploy configuration changes impacting listeners
             ovn_charm.configure_ovn(
@@ -12,14 +12,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from copy import deepcopy
+from types import SimpleNamespace
 from unittest import TestCase
-from unittest.mock import MagicMock, patch, call
+from unittest.mock import DEFAULT, MagicMock, patch, call
 
 import yaml
 
 import actions.cluster as cluster_actions
 
+SB_CLUSTER_STATUS = {"Southbound": "status"}
+NB_CLUSTER_STATUS = {"Northbound": "status"}
+SB_CLUSTER_STATUS_YAML = yaml.dump(
+    SB_CLUSTER_STATUS, Dumper=cluster_actions.YAML_DUMPER, sort_keys=False
+)
+NB_CLUSTER_STATUS_YAML = yaml.dump(
+    NB_CLUSTER_STATUS, Dumper=cluster_actions.YAML_DUMPER, sort_keys=False
+)
+KICK_PROCESS_OUTPUT = "Failed to kick server"
+KICK_ERROR = cluster_actions.subprocess.CalledProcessError(
+    -1, "/usr/sbin/ovs-appctl", KICK_PROCESS_OUTPUT
+)
+
 
 class ClusterActionTests(TestCase):
 
@@ -29,71 +42,46 @@ class ClusterActionTests(TestCase):
         "ovn-central/2": {"id": "cc33", "address": "ssl:10.0.0.3:6644"},
     }
 
-    @property
-    def servers(self):
-        """Return list of tuples representing servers in cluster.
-
-        This property uses data from self.UNIT_MAPPING to produce output
-        similar to that of OVNClusterStatus.servers attribute.
-
-        :rtype: List[Tuple(str, str)]
-        """
-        servers = []
-        for server in self.UNIT_MAPPING.values():
-            servers.append((server["id"], server["address"]))
-        return servers
-
-    @property
-    def unit_ip_map(self):
-        """Return mapping between unit names and their IPs.
-
-        This property uses data from self.UNIT_MAPPING.
+    # Servers in cluster, similar to OVNClusterStatus.servers attribute.
+    SERVERS = [
+        (server["id"], server["address"]) for server in UNIT_MAPPING.values()
+    ]
 
-        :rtype: Dict[str, str]
-        """
-        unit_map = {}
-        for unit, data in self.UNIT_MAPPING.items():
-            unit_map[unit] = data["address"].split(":")[1]
-        return unit_map
-
-    @property
-    def unit_id_map(self):
-        """Return mapping between unit names and their IDs.
-
-        This property uses data from self.UNIT_MAPPING.
+    # Mapping between unit names and their IPs.
+    UNIT_IP_MAP = {
+        unit: data["address"].split(":")[1]
+        for unit, data in UNIT_MAPPING.items()
+    }
 
-        :rtype: Dict[str, str]
-        """
-        unit_map = {}
-        for unit, data in self.UNIT_MAPPING.items():
-            unit_map[unit] = data["id"]
-        return unit_map
+    # Mapping between unit names and their cluster server IDs.
+    UNIT_ID_MAP = {unit: data["id"] for unit, data in UNIT_MAPPING.items()}
 
     def setUp(self):
         """Setup and clean up frequent mocks."""
         super().setUp()
+        # Mock actions mapped in the cluster.py otherwise they'd refer
+        # to non-mocked functions.
+        self.mapped_action_cluster_kick = MagicMock()
+        self.mapped_action_cluster_status = MagicMock()
+
         mocks = [
-            patch.object(cluster_actions.ch_core.hookenv, "action_get"),
-            patch.object(cluster_actions.ch_core.hookenv, "action_set"),
-            patch.object(cluster_actions.ch_core.hookenv, "action_fail"),
+            patch.multiple(
+                cluster_actions.ch_core.hookenv,
+                action_get=DEFAULT,
+                action_set=DEFAULT,
+                action_fail=DEFAULT,
+            ),
             patch.object(cluster_actions.ch_ovn, "ovn_appctl"),
+            patch.dict(cluster_actions.ACTIONS, {
+                "cluster-kick": self.mapped_action_cluster_kick,
+                "cluster-status": self.mapped_action_cluster_status,
+            }),
         ]
 
         for mock in mocks:
             mock.start()
             self.addCleanup(mock.stop)
 
-        # Mock actions mapped in the cluster.py otherwise they'd refer
-        # to non-mocked functions.
-        self.mapped_action_cluster_kick = MagicMock()
-        self.mapped_action_cluster_status = MagicMock()
-        cluster_actions.ACTIONS[
-            "cluster-kick"
-        ] = self.mapped_action_cluster_kick
-        cluster_actions.ACTIONS[
-            "cluster-status"
-        ] = self.mapped_action_cluster_status
-
     def test_url_to_ip(self):
         """Test function that parses IPs out of server URLs."""
         valid_ipv4 = "10.0.0.1"
@@ -109,11 +97,19 @@ class ClusterActionTests(TestCase):
         ipv6 = cluster_actions._url_to_ip(url.format(valid_ipv6))
         self.assertEqual(ipv6, valid_ipv6)
 
+        # Parse valid IPv6 enclosed in brackets
+        ipv6 = cluster_actions._url_to_ip(url.format(
+            "[{}]".format(valid_ipv6)))
+        self.assertEqual(ipv6, valid_ipv6)
+
         # Parse invalid url
-        cluster_actions.ch_ip.is_ip.return_value = False
         with self.assertRaises(cluster_actions.StatusParsingException):
             cluster_actions._url_to_ip(url.format(invalid_addr))
 
+        # Parse url without port
+        with self.assertRaises(cluster_actions.StatusParsingException):
+            cluster_actions._url_to_ip(invalid_addr)
+
     @patch.object(cluster_actions.ch_ovn, 'OVNClusterStatus')
     def test_format_cluster_status(self, mock_cluster_status):
         """Test turning OVNClusterStatus into dict.
@@ -121,16 +117,16 @@ class ClusterActionTests(TestCase):
         Resulting dict also contains additional info mapping cluster servers
         to the juju units.
         """
-        sample_data = {"cluster_id": "11aa", "servers": self.servers}
+        sample_data = {"cluster_id": "11aa", "servers": self.SERVERS}
         mock_cluster_status.to_yaml.return_value = sample_data
-        mock_cluster_status.servers = self.servers
+        mock_cluster_status.servers = self.SERVERS
 
         cluster_status = cluster_actions._format_cluster_status(
-            mock_cluster_status, self.unit_ip_map
+            mock_cluster_status, self.UNIT_IP_MAP
         )
         # Compare resulting dict with expected data
         expected_status = sample_data.copy()
-        expected_status["unit_map"] = self.unit_id_map
+        expected_status["unit_map"] = self.UNIT_ID_MAP
         self.assertEqual(cluster_status, expected_status)
 
     @patch.object(cluster_actions.ch_ovn, 'OVNClusterStatus')
@@ -145,7 +141,7 @@ class ClusterActionTests(TestCase):
         missing_server_id = "ff99"
         missing_server_ip = "10.0.0.99"
         missing_server_url = "ssl:{}:6644".format(missing_server_ip)
-        servers = self.servers.copy()
+        servers = list(self.SERVERS)
         servers.append((missing_server_id, missing_server_url))
 
         sample_data = {"cluster_id": "11aa", "servers": servers}
@@ -153,11 +149,11 @@ class ClusterActionTests(TestCase):
         mock_cluster_status.servers = servers
 
         cluster_status = cluster_actions._format_cluster_status(
-            mock_cluster_status, self.unit_ip_map
+            mock_cluster_status, self.UNIT_IP_MAP
         )
         # Compare resulting dict with expected data
         expected_status = sample_data.copy()
-        expected_status["unit_map"] = self.unit_id_map
+        expected_status["unit_map"] = dict(self.UNIT_ID_MAP)
         expected_status["unit_map"]["UNKNOWN"] = [missing_server_id]
 
         self.assertEqual(cluster_status, expected_status)
@@ -170,49 +166,41 @@ class ClusterActionTests(TestCase):
             mock_cluster_status
     ):
         """Test failure to parse status with format_cluster_status()."""
-        sample_data = {"cluster_id": "11aa", "servers": self.servers}
+        sample_data = {"cluster_id": "11aa", "servers": self.SERVERS}
         mock_cluster_status.to_yaml.return_value = sample_data
-        mock_cluster_status.servers = self.servers
+        mock_cluster_status.servers = self.SERVERS
         mock_url_to_ip.side_effect = cluster_actions.StatusParsingException
 
         with self.assertRaises(cluster_actions.StatusParsingException):
             cluster_actions._format_cluster_status(
-                mock_cluster_status, self.unit_ip_map
+                mock_cluster_status, self.UNIT_IP_MAP
             )
 
     @patch.object(cluster_actions.reactive, "endpoint_from_flag")
     @patch.object(cluster_actions.ch_core.hookenv, "local_unit")
     def test_cluster_ip_map(self, mock_local_unit, mock_endpoint_from_flag):
         """Test generating map of unit IDs and their IPs."""
-        expected_map = {}
-        remote_unit_data = deepcopy(self.UNIT_MAPPING)
-        remote_units = []
+        remote_unit_data = dict(self.UNIT_IP_MAP)
         local_unit_name = "ovn-central/0"
-        local_unit_data = remote_unit_data.pop(local_unit_name)
-        for unit_name, data in remote_unit_data.items():
-            _, ip, _ = data["address"].split(":")
-            unit = MagicMock()
-            unit.unit_name = unit_name
-            unit.received = {"bound-address": ip}
-            remote_units.append(unit)
-            expected_map[unit_name] = ip
-
-        _, local_unit_ip, _ = local_unit_data["address"].split(":")
-        expected_map[local_unit_name] = local_unit_ip
-
-        endpoint = MagicMock()
-        relation = MagicMock()
+        local_unit_ip = remote_unit_data.pop(local_unit_name)
+        remote_units = [
+            SimpleNamespace(
+                unit_name=unit_name, received={"bound-address": ip}
+            )
+            for unit_name, ip in remote_unit_data.items()
+        ]
 
-        relation.units = remote_units
-        endpoint.relations = [relation]
-        endpoint.cluster_local_addr = local_unit_ip
+        endpoint = SimpleNamespace(
+            relations=[SimpleNamespace(units=remote_units)],
+            cluster_local_addr=local_unit_ip,
+        )
 
         mock_local_unit.return_value = local_unit_name
         mock_endpoint_from_flag.return_value = endpoint
 
         unit_mapping = cluster_actions._cluster_ip_map()
 
-        self.assertEqual(unit_mapping, expected_map)
+        self.assertEqual(unit_mapping, self.UNIT_IP_MAP)
 
     def test_kick_server_success(self):
         """Test successfully kicking server from cluster"""
@@ -250,13 +238,18 @@ class ClusterActionTests(TestCase):
         with self.assertRaises(ValueError):
             cluster_actions._kick_server("foo", "11aa")
 
+    @patch.object(cluster_actions.charms_openstack.bus, "discover")
     @patch.object(
         cluster_actions.charms_openstack.charm, "provide_charm_instance"
     )
     @patch.object(cluster_actions, "_cluster_ip_map")
     @patch.object(cluster_actions, "_format_cluster_status")
     def test_cluster_status(
-        self, format_cluster_mock, cluster_map_mock, provide_instance_mock
+        self,
+        format_cluster_mock,
+        cluster_map_mock,
+        provide_instance_mock,
+        discover_mock,
     ):
         """Test cluster-status action implementation."""
         sb_raw_status = "Southbound status"
@@ -271,35 +264,23 @@ class ClusterActionTests(TestCase):
         ip_map = {"ovn-central/0": "10.0.0.0"}
         cluster_map_mock.return_value = ip_map
 
-        sb_cluster_status = {"Southbound": "status"}
-        nb_cluster_status = {"Northbound": "status"}
         format_cluster_mock.side_effect = [
-            sb_cluster_status,
-            nb_cluster_status,
+            SB_CLUSTER_STATUS,
+            NB_CLUSTER_STATUS,
         ]
 
         # Test successfully generating cluster status
         cluster_actions.cluster_status()
 
-        expected_calls = [
-            call(
-                {
-                    "ovnsb": yaml.safe_dump(
-                        sb_cluster_status, sort_keys=False
-                    )
-                }
-            ),
-            call(
-                {
-                    "ovnnb": yaml.dump(
-                        nb_cluster_status, sort_keys=False
-                    )
-                }
-            ),
-        ]
-        cluster_actions.ch_core.hookenv.action_set.assert_has_calls(
-            expected_calls)
-        cluster_actions.ch_core.hookenv.action_fail.asser_not_called()
+        discover_mock.assert_called_once_with()
+
+        expected_output = {
+            "ovnsb": SB_CLUSTER_STATUS_YAML,
+            "ovnnb": NB_CLUSTER_STATUS_YAML,
+        }
+        cluster_actions.ch_core.hookenv.action_set.assert_called_once_with(
+            expected_output)
+        cluster_actions.ch_core.hookenv.action_fail.assert_not_called()
 
         # Reset mocks
         cluster_actions.ch_core.hookenv.action_set.reset_mock()
@@ -362,13 +343,9 @@ class ClusterActionTests(TestCase):
         ]
 
         # Test failure to kick server from Southbound cluster
-        process_output = "Failed to kick server"
-        exception = cluster_actions.subprocess.CalledProcessError(
-            -1, "/usr/sbin/ovs-appctl", process_output
-        )
-        kick_server_mock.side_effect = exception
+        kick_server_mock.side_effect = KICK_ERROR
         err = "Failed to kick Southbound cluster member {}: {}".format(
-            sb_id, process_output
+            sb_id, KICK_PROCESS_OUTPUT
         )
 
         cluster_actions.cluster_kick()
@@ -410,13 +387,9 @@ class ClusterActionTests(TestCase):
         ]
 
         # Test failure to kick server from Northbound cluster
-        process_output = "Failed to kick server"
-        exception = cluster_actions.subprocess.CalledProcessError(
-            -1, "/usr/sbin/ovs-appctl", process_output
-        )
-        kick_server_mock.side_effect = exception
+        kick_server_mock.side_effect = KICK_ERROR
         err = "Failed to kick Northbound cluster member {}: {}".format(
-            nb_id, process_output
+            nb_id, KICK_PROCESS_OUTPUT
         )
 
         cluster_actions.cluster_kick()
@@ -467,20 +440,16 @@ class ClusterActionTests(TestCase):
 
         # Test failure to kick servers from Northbound and Southbound
         # clusters
-        process_output = "Failed to kick server"
-        exception = cluster_actions.subprocess.CalledProcessError(
-            -1, "/usr/sbin/ovs-appctl", process_output
-        )
-        kick_server_mock.side_effect = exception
+        kick_server_mock.side_effect = KICK_ERROR
         errors = [
             call(
                 "Failed to kick Southbound cluster member {}: {}".format(
-                    sb_id, process_output
+                    sb_id, KICK_PROCESS_OUTPUT
                 )
             ),
             call(
                 "Failed to kick Northbound cluster member {}: {}".format(
-                    nb_id, process_output
+                    nb_id, KICK_PROCESS_OUTPUT
                 )
             ),
         ]
@@ -14,7 +14,6 @@
 
 import os
 import collections
-import io
 import tempfile
 import unittest.mock as mock
 
@@ -49,6 +48,7 @@ class TestOVNCentralConfigurationAdapter(test_utils.PatchHelper):
         self.charm_instance.ovn_sysconfdir.return_value = '/etc/path'
         self.target = ovn_central.OVNCentralConfigurationAdapter(
             charm_instance=self.charm_instance)
+        ovn_central._lsb_release.cache_clear()
 
     def test__ovn_source(self):
         self.patch_object(ovn_central.reactive, 'is_flag_set',
@@ -84,7 +84,12 @@ class TestOVNCentralConfigurationAdapter(test_utils.PatchHelper):
         # this version on jammy
         self.is_flag_set.return_value = True
         self.lsb_release.return_value = {'DISTRIB_CODENAME': 'jammy'}
+        ovn_central._lsb_release.cache_clear()
+        self.lsb_release.reset_mock()
         self.assertEqual('', self.target._ovn_source)
+        # Release information is read from the host only once
+        self.assertEqual('', self.target._ovn_source)
+        self.lsb_release.assert_called_once_with()
 
 
 class TestOVNCentralCharm(Helper):
@@ -190,6 +195,14 @@ class TestOVNCentralCharm(Helper):
         self.add_source.assert_called_once_with('cloud:focal-ovn-22.03')
         self.assertFalse(self.configure_source.called)
 
+    def test_configure_sources(self):
+        self.patch_target('configure_ovn_source')
+        self.patch_target('configure_source')
+        self.target.configure_sources()
+        self.target.configure_sources()
+        self.configure_ovn_source.assert_called_once_with()
+        self.configure_source.assert_called_once_with()
+
     def test_states_to_check(self):
         self.maxDiff = None
         expect = collections.OrderedDict([
@@ -220,6 +233,44 @@ class TestOVNCentralCharm(Helper):
         self.target.ports_to_check()
         self.target._default_port_list.assert_called_once_with()
 
+    def test_cluster_status(self):
+        self.patch_object(ovn_central.ch_ovn, 'cluster_status')
+        self.patch_object(ovn_central.time, 'monotonic', return_value=100)
+        self.cluster_status.return_value = 'fake-status'
+        self.assertEqual(self.target.cluster_status('ovnsb_db'),
+                         'fake-status')
+        self.assertEqual(self.target.cluster_status('ovnsb_db'),
+                         'fake-status')
+        self.cluster_status.assert_called_once_with(
+            'ovnsb_db', rundir='/var/run/ovn', use_ovs_appctl=False)
+        # cached status expires
+        self.monotonic.return_value = 102
+        self.target.cluster_status('ovnsb_db')
+        self.assertEqual(self.cluster_status.call_count, 2)
+        # cached status is discarded on request
+        self.target.invalidate_cluster_status('ovnsb_db')
+        self.target.cluster_status('ovnsb_db')
+        self.assertEqual(self.cluster_status.call_count, 3)
+        # failures are not cached
+        self.target.invalidate_cluster_status()
+        self.cluster_status.side_effect = ValueError
+        self.assertIsNone(self.target.cluster_status('ovnnb_db'))
+        self.cluster_status.side_effect = None
+        self.assertEqual(self.target.cluster_status('ovnnb_db'),
+                         'fake-status')
+
+    def test_render_with_interfaces(self):
+        self.patch_object(ovn_central.ch_ovn, 'cluster_status')
+        self.patch_object(ovn_central.charms_openstack.charm.OpenStackCharm,
+                          'render_with_interfaces')
+        self.target.cluster_status('ovnsb_db')
+        # services may be restarted while rendering
+        self.target.render_with_interfaces(['interface'])
+        self.render_with_interfaces.assert_called_once_with(
+            ['interface'], configs=None)
+        self.target.cluster_status('ovnsb_db')
+        self.assertEqual(self.cluster_status.call_count, 2)
+
     def test_cluster_status_mesage(self):
         self.patch_target('cluster_status')
         self.patch_target('is_northd_active')
@@ -279,11 +330,13 @@ class TestOVNCentralCharm(Helper):
         self.target.check_if_paused.assert_called_once_with()
         self.assertFalse(self.service_resume.called)
         self.target.check_if_paused.return_value = (None, None)
+        self.target._cluster_status_cache['ovnsb_db'] = (0, 'fake-status')
         self.target.enable_services()
         calls = []
         for service in self.target.services:
             calls.append(mock.call(service))
         self.service_resume.assert_has_calls(calls)
+        self.assertEqual(self.target._cluster_status_cache, {})
 
     def test_run(self):
         self.patch_object(ovn_central.subprocess, 'run')
@@ -298,6 +351,7 @@ class TestOVNCentralCharm(Helper):
 
     def test_join_cluster(self):
         self.patch_target('run')
+        self.patch_object(ovn_central.os.path, 'exists', return_value=False)
         self.target.join_cluster('/a/db.file',
                                  'aSchema',
                                  ['ssl:a.b.c.d:1234'],
@@ -305,6 +359,14 @@ class TestOVNCentralCharm(Helper):
         self.run.assert_called_once_with(
             'ovsdb-tool', 'join-cluster', '/a/db.file', 'aSchema',
             'ssl:a.b.c.d:1234', 'ssl:e.f.g.h:1234', 'ssl:i.j.k.l:1234')
+        self.run.reset_mock()
+        self.target.join_cluster('db.file',
+                                 'aSchema',
+                                 ['ssl:a.b.c.d:1234'],
+                                 ['ssl:e.f.g.h:1234'])
+        self.run.assert_called_once_with(
+            'ovsdb-tool', 'join-cluster', '/var/lib/ovn/db.file', 'aSchema',
+            'ssl:a.b.c.d:1234', 'ssl:e.f.g.h:1234')
 
     def test_configure_tls(self):
         self.patch_target('get_certs_and_keys')
@@ -315,20 +377,16 @@ class TestOVNCentralCharm(Helper):
             'ca': 'fakeca',
             'chain': 'fakechain',
         }]
-        with mock.patch('builtins.open', create=True) as mocked_open:
-            mocked_file = mock.MagicMock(spec=io.FileIO)
-            mocked_open.return_value = mocked_file
-            self.target.configure_cert = mock.MagicMock()
-            self.target.configure_tls()
-            mocked_open.assert_called_once_with(
-                '/etc/ovn/ovn-central.crt', 'w')
-            mocked_file.__enter__().write.assert_called_once_with(
-                'fakeca\nfakechain')
-            self.target.configure_cert.assert_called_once_with(
-                '/etc/ovn',
-                'fakecert',
-                'fakekey',
-                cn='host')
+        self.patch_object(ovn_central, 'write_file')
+        self.patch_target('configure_cert')
+        self.target.configure_tls()
+        self.write_file.assert_called_once_with(
+            '/etc/ovn/ovn-central.crt', b'fakeca\nfakechain', perms=0o644)
+        self.configure_cert.assert_called_once_with(
+            '/etc/ovn',
+            'fakecert',
+            'fakekey',
+            cn='host')
 
     def test_configure_ovn_listener(self):
         self.patch_object(ovn_central.ch_ovsdb, 'SimpleOVSDB')
@@ -344,26 +402,28 @@ class TestOVNCentralCharm(Helper):
         self.assertFalse(self.SimpleOVSDB.called)
         cluster_status.is_cluster_leader = True
         ovsdb = mock.MagicMock()
-        ovsdb.connection.find.side_effect = [
-            [],
-            [{'_uuid': 'fake-uuid'}],
-            [],
-            [{'_uuid': 'fake-uuid'}],
+        ovsdb.connection.__iter__.return_value = [
+            {'_uuid': 'fake-uuid', 'target': 'pssl:6642', 'role': ''},
+            {'_uuid': 'other-uuid', 'target': 'ptcp:6640'},
         ]
         self.SimpleOVSDB.return_value = ovsdb
         self.target.configure_ovn_listener('nb', port_map)
-        self.run.assert_has_calls([
-            mock.call('ovn-nbctl', '--', '--id=@connection', 'create',
-                      'connection', 'target="pssl:6641"', '--', 'add',
-                      'NB_Global', '.', 'connections', '@connection'),
-            mock.call('ovn-nbctl', '--', '--id=@connection', 'create',
-                      'connection', 'target="pssl:6642"', '--', 'add',
-                      'NB_Global', '.', 'connections', '@connection'),
-        ])
-        ovsdb.connection.set.assert_has_calls([
-            mock.call('fake-uuid', 'inactivity_probe', 42),
-            mock.call('fake-uuid', 'role', 'ovn-controller')
-        ])
+        self.run.assert_called_once_with(
+            'ovn-nbctl',
+            '--', '--id=@connection6641', 'create', 'connection',
+            'target="pssl:6641"', 'inactivity_probe=42',
+            '--', 'add', 'NB_Global', '.', 'connections', '@connection6641',
+            '--', 'set', 'connection', 'fake-uuid', 'role=ovn-controller')
+        # nothing to do when listeners are configured already
+        self.run.reset_mock()
+        ovsdb.connection.__iter__.return_value = [
+            {'_uuid': 'fake-uuid', 'target': 'pssl:6641',
+             'inactivity_probe': 42},
+            {'_uuid': 'fake-uuid', 'target': 'pssl:6642',
+             'role': 'ovn-controller'},
+        ]
+        self.target.configure_ovn_listener('nb', port_map)
+        self.assertFalse(self.run.called)
 
     def test_validate_config(self):
         self.patch_target('config')
@@ -478,7 +538,9 @@ class TestOVNCentralCharm(Helper):
         self.config.__getitem__.return_value = 42
         self.patch_target('configure_ovn_listener')
         self.patch_target('configure_ovsdb_election_timer')
+        self.target._cluster_status_cache['ovnsb_db'] = (0, 'fake-status')
         self.target.configure_ovn(1, 2, 3)
+        self.assertEqual(self.target._cluster_status_cache, {})
         self.config.__getitem__.assert_has_calls([
             mock.call('ovsdb-server-inactivity-probe'),
             mock.call('ovsdb-server-election-timer'),
@@ -486,9 +548,10 @@ class TestOVNCentralCharm(Helper):
         self.configure_ovn_listener.assert_has_calls([
             mock.call('nb', {1: {'inactivity_probe': 42000}}),
             mock.call('sb', {2: {'role': 'ovn-controller',
-                                 'inactivity_probe': 42000}}),
-            mock.call('sb', {3: {'inactivity_probe': 42000}}),
+                                 'inactivity_probe': 42000},
+                             3: {'inactivity_probe': 42000}}),
         ])
+        self.assertEqual(self.configure_ovn_listener.call_count, 2)
         self.configure_ovsdb_election_timer.assert_has_calls([
             mock.call('nb', 42),
             mock.call('sb', 42),
@@ -507,6 +570,11 @@ class TestOVNCentralCharm(Helper):
     def test_configure_firewall(self):
         self.patch_object(ovn_central, 'ch_ufw')
         self.ch_ufw.status.return_value = [
+            (7, {
+                'to': '1/tcp',
+                'action': 'allow in',
+                'from': 'a.b.c.d',
+                'comment': 'charm-ovn-central'}),
             (42, {
                 'action': 'allow in',
                 'from': 'q.r.s.t',
@@ -535,8 +603,6 @@ class TestOVNCentralCharm(Helper):
                       comment='charm-ovn-central'),
         ], any_order=True)
         self.ch_ufw.modify_access.assert_has_calls([
-            mock.call('a.b.c.d', port=1, proto='tcp', action='allow',
-                      prepend=True, comment='charm-ovn-central'),
             mock.call('e.f.g.h', port=1, proto='tcp', action='allow',
                       prepend=True, comment='charm-ovn-central'),
             mock.call('a.b.c.d', port=2, proto='tcp', action='allow',
@@ -563,6 +629,11 @@ class TestOVNCentralCharm(Helper):
         self.ch_ufw.modify_access.assert_has_calls([
             mock.call(None, dst=None, action='delete', index=42)
         ])
+        # rules already in place are not added again
+        self.assertNotIn(
+            mock.call('a.b.c.d', port=1, proto='tcp', action='allow',
+                      prepend=True, comment='charm-ovn-central'),
+            self.ch_ufw.modify_access.call_args_list)
         self.ch_ufw.reset_mock()
         self.target.configure_firewall({
             (1, 2, 3, 4,): ('a.b.c.d', 'e.f.g.h',),
@@ -586,8 +657,6 @@ class TestOVNCentralCharm(Helper):
                       comment='charm-ovn-central'),
         ], any_order=True)
         self.ch_ufw.modify_access.assert_has_calls([
-            mock.call('a.b.c.d', port=1, proto='tcp', action='allow',
-                      prepend=True, comment='charm-ovn-central'),
             mock.call('e.f.g.h', port=1, proto='tcp', action='allow',
                       prepend=True, comment='charm-ovn-central'),
             mock.call('a.b.c.d', port=2, proto='tcp', action='allow',
@@ -606,6 +675,11 @@ class TestOVNCentralCharm(Helper):
         self.ch_ufw.modify_access.assert_has_calls([
             mock.call(None, dst=None, action='delete', index=42)
         ])
+        # rules already in place are not added again
+        self.assertNotIn(
+            mock.call('a.b.c.d', port=1, proto='tcp', action='allow',
+                      prepend=True, comment='charm-ovn-central'),
+            self.ch_ufw.modify_access.call_args_list)
 
     def test_render_nrpe(self):
         with tempfile.TemporaryDirectory() as dtmp:
@@ -626,6 +700,38 @@ class TestOVNCentralCharm(Helper):
                 mock.call().write(),
             ])
 
+    def test_add_nrpe_certs_check(self):
+        self.patch_object(ovn_central, 'rsync')
+        self.patch_object(ovn_central, 'write_file')
+        self.patch_object(ovn_central.ch_fetch, 'filter_installed_packages')
+        self.patch_object(ovn_central.ch_fetch, 'apt_install')
+        charm_nrpe = mock.MagicMock()
+        with mock.patch.dict(os.environ, {'CHARM_DIR': '/charm'}):
+            self.filter_installed_packages.return_value = []
+            self.target.add_nrpe_certs_check(charm_nrpe)
+            self.assertFalse(self.apt_install.called)
+            self.filter_installed_packages.return_value = [
+                'python3-cryptography']
+            self.target.add_nrpe_certs_check(charm_nrpe)
+            self.apt_install.assert_called_once_with(
+                ['python3-cryptography'])
+        self.rsync.assert_has_calls([
+            mock.call('/charm/files/nagios/nrpe_check_ovn_certs.py',
+                      '/usr/local/lib/nagios/plugins/nrpe_check_ovn_certs.py'),
+            mock.call('/charm/files/scripts/check_ovn_certs.py',
+                      '/usr/local/bin/check_ovn_certs.py'),
+        ])
+
+    def test_deferable_services(self):
+        expect = ['ovn-central', 'ovn-northd', 'ovn-ovsdb-server-nb',
+                  'ovn-ovsdb-server-sb']
+        self.assertEqual(sorted(self.target.deferable_services), expect)
+        # Train does not list the ovsdb servers in its services, they are
+        # deferred regardless
+        self.patch_release(ovn_central.TrainOVNCentralCharm.release)
+        self.target = ovn_central.TrainOVNCentralCharm()
+        self.assertEqual(sorted(self.target.deferable_services), expect)
+
     def test_configure_deferred_restarts(self):
         self.patch_object(
             ovn_central.ch_core.hookenv,
@@ -826,9 +932,12 @@ class TestOVNCentralCharm(Helper):
             mock.call("ovnnb_db", ("cluster/leave", "OVN_Northbound")),
         ]
 
+        self.target._cluster_status_cache['ovnsb_db'] = (0, 'fake-status')
+
         self.target.leave_cluster()
 
         ovn_central.ch_ovn.ovn_appctl.assert_has_calls(expected_calls)
+        self.assertEqual(self.target._cluster_status_cache, {})
 
     def test_cluster_leave_fail(self):
         """Test failure during leaving of OVN cluster."""
@@ -906,7 +1015,8 @@ class TestOVNCentralCharm(Helper):
         self.patch_target("is_server_in_cluster", return_value=True)
         self.patch_target("cluster_status")
         timeout = 30
-        expected_retries = 6
+        # 0.25 + 0.5 + 1 + 2 + 4 + 5 * 5 seconds
+        expected_retries = 10
         expected_calls = []
         for i in range(expected_retries):
             expected_calls.append(mock.call("ovnsb_db"))
@@ -916,6 +1026,11 @@ class TestOVNCentralCharm(Helper):
 
         self.assertFalse(result)
         self.target.cluster_status.assert_has_calls(expected_calls)
+        self.assertEqual(self.target.cluster_status.call_count,
+                         2 * expected_retries)
+        self.sleep.assert_has_calls([
+            mock.call(0.25), mock.call(0.5), mock.call(1), mock.call(2),
+            mock.call(4), mock.call(5)])
 
     def test_wait_for_server_leave_true(self):
         """Test waiting until server leaves cluster.
@@ -252,6 +252,11 @@ class TestOvnCentralHandlers(test_utils.PatchHelper):
         handlers.publish_addr_to_clients()
         ovsdb.publish_cluster_local_addr.assert_called_once_with('a.b.c.d')
         ovsdb_cms.publish_cluster_local_addr.assert_called_once_with('a.b.c.d')
+        # absent client relations are skipped
+        ovsdb.reset_mock()
+        self.endpoint_from_flag.side_effect = [ovsdb_peer, ovsdb, None]
+        handlers.publish_addr_to_clients()
+        ovsdb.publish_cluster_local_addr.assert_called_once_with('a.b.c.d')
 
     def test_render(self):
         self.patch_object(handlers.reactive, 'endpoint_from_name')
@@ -264,10 +269,19 @@ class TestOvnCentralHandlers(test_utils.PatchHelper):
                            'ssl:e.f.g.h:1234',
                            'ssl:i.j.k.l:1234',)
         ovsdb_peer.db_connection_strs.return_value = connection_strs
+        cluster_remote_addrs = mock.PropertyMock(
+            return_value=['e.f.g.h', 'i.j.k.l'])
+        type(ovsdb_peer).cluster_remote_addrs = cluster_remote_addrs
         self.endpoint_from_flag.return_value = ovsdb_peer
         self.target.enable_services.return_value = False
         handlers.render()
         self.endpoint_from_flag.assert_called_once_with('ovsdb-peer.available')
+        # remote addresses are retrieved once for both databases
+        cluster_remote_addrs.assert_called_once_with()
+        ovsdb_peer.db_connection_strs.assert_has_calls([
+            mock.call(('e.f.g.h', 'i.j.k.l'), ovsdb_peer.db_nb_cluster_port),
+            mock.call(('e.f.g.h', 'i.j.k.l'), ovsdb_peer.db_sb_cluster_port),
+        ], any_order=True)
         self.target.render_with_interfaces.assert_called_once_with(
             [ovsdb_peer])
         self.target.join_cluster.assert_has_calls([